@@ -92,6 +92,11 @@ def extraprec(x: int):
         This method does not do anything if the backend has fixed precision."""
     return __bd_wrapper.bd.extraprec(x)
     
+def native_complex_dtype():
+    """Returns the numpy dtype to be used for dense coefficient storage, or None if the
+    scalars of the backend are arbitrary Python objects (e.g., arbitrary precision)."""
+    return __bd_wrapper.bd.native_complex_dtype()
+
 def chop(x):
     """Returns the same number, or 0 if `abs(x)` goes below the machine threshold."""
     return __bd_wrapper.bd.chop(x)
@@ -47,7 +47,13 @@ class NumericBackend:
     def machine_threshold(self):
         """Returns the threshold of the backend. Any number under this threshold can be chopped to zero."""
         raise NotImplementedError()
-    
+
+    def native_complex_dtype(self):
+        """Returns the numpy dtype to be used for dense coefficient storage, or None if the
+        scalars of the backend are arbitrary Python objects (e.g., arbitrary precision)."""
+        return None
+
+
     def workdps(self, x: int):
         """Temporarily sets the working precision to the given value (in dps).
         This method does not do anything if the backend has fixed precision.
@@ -49,7 +49,11 @@ class NumpyBackend(NumericBackend):
     
     def machine_threshold(self):
         return 1e-8
-    
+
+    def native_complex_dtype(self):
+        return self.dtype
+
+
     def chop(self, x: generic_complex):
         thr = self.machine_threshold()
 
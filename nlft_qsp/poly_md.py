@@ -1,238 +1,328 @@
 
-import itertools
+import functools
 from math import prod
 from numbers import Number
 from typing import Iterable
 
+import numpy as np
+import scipy.fft
+
 import numerics as bd
 from numerics.backend import generic_complex, generic_real
 
 from poly import Polynomial
-from util import flatten, next_power_of_two, sequence_shift
+from util import next_power_of_two
 
-def minimal_covering_range(l):
-    """Given a list of tuples `l` containing `range` objects, returns a tuple `t` containing `range`
-    objects such that `t[k] is the minimal range containing `l[j][k]` for every `j`."""
-    if len(l) == 0:
-        return ()
-    
-    N = max(len(t) for t in l)
+def _estrin_reduce(coeffs: np.ndarray, zk: generic_complex) -> np.ndarray:
+    """Reduces the last axis of `coeffs` by evaluating it at `zk` with Estrin's scheme.
+
+    Coefficients are folded in pairs `even + zk^(2^j) * odd`, halving the axis at every pass,
+    so the multiply-add dependency chain has logarithmic instead of linear depth."""
+    w = zk
+    while coeffs.shape[-1] > 1:
+        even = coeffs[..., 0::2]
+        odd = coeffs[..., 1::2]
+
+        if odd.shape[-1] < even.shape[-1]: # odd length, the last coefficient has no pair
+            coeffs = even.copy()
+            coeffs[..., :odd.shape[-1]] += w * odd
+        else:
+            coeffs = even + w * odd
+
+        w = w * w
+
+    return coeffs[..., 0]
+
+def horner_eval(coeffs: np.ndarray, z: tuple[generic_complex]) -> generic_complex:
+    """Evaluates the multivariate polynomial with the given dense coefficient array at the point z,
+    reducing one axis at a time, innermost first.
+
+    The innermost (stride-1) axis is reduced with Estrin's scheme, which breaks the serial
+    dependency of Horner's recurrence; the outer axes use plain Horner steps. Every step is
+    vectorized over the axes that are not yet reduced, so the number of interpreted iterations
+    is only the sum of the axis lengths, not their product."""
+    if coeffs.size == 0:
+        return coeffs.dtype.type(0)
+
+    for k, zk in enumerate(reversed(z)):
+        if k == 0 and coeffs.shape[-1] >= 8:
+            coeffs = _estrin_reduce(coeffs, zk)
+            continue
+
+        acc = coeffs[..., -1]
+        for i in range(coeffs.shape[-1] - 2, -1, -1):
+            acc = acc * zk + coeffs[..., i]
+        coeffs = acc
+
+    # indexing an object-dtype array with a scalar already yields a bare backend scalar
+    return coeffs[()] if isinstance(coeffs, np.ndarray) else coeffs
+
+_TILE_ELEMENTS = 1 << 10 # two complex128 operand tiles of this size stay resident in a 32 KiB L1 cache
+
+def tiled_binary(func, a: np.ndarray, b: np.ndarray, out: np.ndarray):
+    """Applies the elementwise ufunc as `func(a, b, out=out)`, recursively bisecting the
+    largest axis until the operand tiles fit in L1 cache, so that grids exceeding L2 are
+    combined one cache-resident block at a time."""
+    if a.size <= _TILE_ELEMENTS:
+        func(a, b, out=out)
+        return
+
+    ax = max(range(a.ndim), key=lambda j: a.shape[j])
+    mid = a.shape[ax] // 2
+
+    lo = tuple(slice(0, mid) if j == ax else slice(None) for j in range(a.ndim))
+    hi = tuple(slice(mid, None) if j == ax else slice(None) for j in range(a.ndim))
+
+    tiled_binary(func, a[lo], b[lo], out[lo])
+    tiled_binary(func, a[hi], b[hi], out[hi])
 
-    return tuple(
-        range(
-            min((rng.start for rng in col if rng is not None), default=0),  
-            max((rng.stop for rng in col if rng is not None), default=0)
-        )
-        for col in zip(*[t + (None,) * (N - len(t)) for t in l])
-    )
+def coeff_dtype():
+    """The dtype used for dense coefficient storage: the native complex dtype of the backend,
+    or object (holding boxed backend scalars) when the backend has no native numpy dtype."""
+    dtype = bd.native_complex_dtype()
+    return dtype if dtype is not None else object
 
-def deep_truncate(l, lens):
-    """Returns the same multidimensional list truncates to the given lengths in each axis.
+def make_coeff(c, dtype):
+    """Converts the scalar to the given coefficient dtype, going through the backend
+    constructor on the object path so that arbitrary-precision scalars are kept intact."""
+    return bd.make_complex(c) if dtype == object else complex(c)
+
+def dense_array(coeffs: list, dim: int) -> np.ndarray:
+    """Converts a (possibly ragged) nested list of numbers into a dense ndarray of
+    rank `dim`, padding missing entries with zeros.
 
     Note:
-        It is assumed that l has dimensions >= lens.
-    
-    Args:
-        lens (tuple[int])"""
-    if len(lens) > 1:
-        ilens = lens[1:]
-        return [deep_truncate(l[k], ilens) for k in range(lens[0])]
-    
-    return l[:lens[0]]
+        Mirroring the constructor of `ComplexL0SequenceMD`, entries of a multidimensional
+        list that are not themselves lists are discarded."""
+    dtype = coeff_dtype()
 
-def deep_horner_eval(l, z: tuple[generic_complex]):
-    """Evaluates the multivariate polynomial with coefficients l using Horner's method."""
-    if len(z) == 0:
-        return l
-    
-    evals = [deep_horner_eval(il, z[1:]) for il in l]
-    
-    res = evals[-1]
-    for k in reversed(range(len(evals) - 1)):
-        res = res * z[0] + evals[k]
+    if dim == 1:
+        if not all(isinstance(c, Number) for c in coeffs):
+            raise ValueError("Coefficient list must be of the corresponding dimension.")
 
-    return res
+        return np.array([make_coeff(c, dtype) for c in coeffs], dtype=dtype)
 
-def deep_sequence_shift(l, s: tuple[int]):
-    """Cyclically shifts the elements along each axis, where k-th axis is shifted by k."""
-    if isinstance(l, list) and len(l) != 0:
-        if isinstance(l[0], Number):
-            return sequence_shift(l, s[0])
-    
-    s1 = s[1:]
-    return sequence_shift([deep_sequence_shift(il, s1) for il in l], s[0])
-
-def deep_sequence_skip(l, s: tuple[int]):
-    """Takes only every `s[k]` element of the list in each axis, the equivalent of l[::s] in multiple dimensions."""
-    if isinstance(l, list) and len(l) != 0:
-        if isinstance(l[0], Number):
-            return l[::s[0]]
-    
-    s1 = s[1:]
-    l = l[::s[0]]
-    return [deep_sequence_skip(il, s1) for il in l]
-
-def deep_inplace(l, func, reverse=False):
-    """Applies the function to each element of the given nested list, in place."""
-    if isinstance(l, list) and len(l) != 0:
-        if reverse:
-            l.reverse()
-
-        if isinstance(l[0], Number):
-            for k in range(len(l)):
-                l[k] = func(l[k])
-        else:
-            for il in l:
-                deep_inplace(il, func, reverse)
+    rows = [dense_array(row, dim - 1) for row in coeffs if isinstance(row, list)]
+    if len(rows) == 0:
+        return np.zeros((0,) * dim, dtype=dtype)
 
-def deep_inplace_binary(l1, l2, func):
-    """Applies the binary function to each element of the given nested lists, in place (they are assumed to be of the same dimension)."""
-    if isinstance(l1, list) and len(l1) != 0:
+    shape = tuple(max(r.shape[k] for r in rows) for k in range(dim - 1))
 
-        if isinstance(l1[0], Number):
-            for k in range(len(l1)):
-                l1[k] = func(l1[k], l2[k])
-        else:
-            for il1, il2 in zip(l1, l2):
-                deep_inplace_binary(il1, il2, func)
+    out = np.zeros((len(rows),) + shape, dtype=dtype)
+    for k, r in enumerate(rows):
+        out[(k,) + tuple(slice(0, n) for n in r.shape)] = r
 
-def zeros(lens):
-    if len(lens) == 1:
-        return [bd.make_complex(0)] * (lens[0])
-    
-    zr = []
-    for k in range(lens[0]):
-        zr.append(zeros(lens[1:]))
-
-    return zr
-
-def sgn(k: int):
-    if k > 0:
-        return 1
-    if k < 0:
-        return -1
-    return 0
-
-def schwarz_multiplier(k: tuple):
-    """Fourier multiplier for the Schwarz transform over several variables."""
-    if all(c == 0 for c in k):
-        return 1
-    
-    if all(c <= 0 for c in k):
-        return 2
-    
-    return 0
+    return out
+
+_COMPILE_MAX_COEFFS = 1 << 12 # above this, the unrolled source outgrows any specialization gain
+
+def _horner_expr(shape: tuple[int], strides: tuple[int], axis: int, offset: int) -> str:
+    """Emits a fully unrolled Horner expression for the polynomial with the given coefficient
+    geometry, reading the flat coefficient buffer `c` and the variables `z0, ..., z{d-1}`."""
+    if axis == len(shape):
+        return f"c[{offset}]"
+
+    expr = _horner_expr(shape, strides, axis + 1, offset + (shape[axis] - 1) * strides[axis])
+    for i in range(shape[axis] - 2, -1, -1):
+        expr = f"({expr})*z{axis} + {_horner_expr(shape, strides, axis + 1, offset + i * strides[axis])}"
+
+    return expr
+
+@functools.lru_cache(maxsize=32)
+def _compiled_eval_code(shape: tuple[int], support_start: tuple[int]):
+    """Code object of a specialized evaluator `_eval(c, z0, ..., z{d-1})` for the given
+    coefficient geometry; shape, strides and support offsets are constant-folded into
+    the emitted source. Cached, since the source only depends on the geometry."""
+    d = len(shape)
+
+    strides = [1] * d
+    for j in range(d - 2, -1, -1):
+        strides[j] = strides[j + 1] * shape[j + 1]
+
+    args = ", ".join(f"z{j}" for j in range(d))
+    body = _horner_expr(shape, tuple(strides), 0, 0)
+    prefactor = "".join(f" * z{j}**({s})" for j, s in enumerate(support_start) if s != 0)
+
+    src = f"def _eval(c, {args}):\n    return ({body}){prefactor}\n"
+    return compile(src, '<poly_md.compile>', 'exec')
+
+@functools.lru_cache(maxsize=32)
+def schwarz_mask(shape: tuple[int], support_start: tuple[int]) -> np.ndarray:
+    """Dense grid of Schwarz-transform Fourier multipliers for a coefficient array
+    of the given shape and support start. The mask only depends on the geometry,
+    so it is cached across calls."""
+    k = np.indices(shape) + np.asarray(support_start).reshape((-1,) + (1,) * len(shape))
+
+    all_zero = np.all(k == 0, axis=0)
+    all_nonpos = np.all(k <= 0, axis=0)
+
+    return np.where(all_zero, 1, np.where(all_nonpos, 2, 0))
 
 
 class ComplexL0SequenceMD:
+    """Represents a multidimensional sequence of complex numbers indexed by Z^dim, whose support is finite.
 
-    def __init__(self, coeffs: list, support_start: tuple[int] | int):
+    Attributes:
+        coeffs (np.ndarray): Dense array of complex coefficients, one axis per dimension.
+        support_start (tuple[int]): Position of the first element of the sequence, along each axis.
+    """
+
+    def __init__(self, coeffs: list | np.ndarray, support_start: tuple[int] | int):
         if isinstance(support_start, int):
             support_start = (support_start,)
 
         self.dim = len(support_start)
-        self._xsupport_start = support_start[0]
+        self._support_start = tuple(support_start)
 
-        if not isinstance(coeffs, list):
-            raise ValueError("Coefficient list must be of type list.")
+        if isinstance(coeffs, np.ndarray):
+            if coeffs.ndim != self.dim:
+                raise ValueError("Coefficient array must be of the corresponding dimension.")
 
-        if self.dim == 1:
-            if not all(isinstance(c, Number) for c in coeffs):
-                raise ValueError("Coefficient list must be of the corresponding dimension.")
-            
-            self.coeffs = [bd.make_complex(c) for c in coeffs]
+            self.coeffs = coeffs.astype(coeff_dtype())
+        elif isinstance(coeffs, list):
+            self.coeffs = dense_array(coeffs, self.dim)
         else:
-            self.coeffs = []
+            raise ValueError("Coefficient list must be of type list.")
 
-            for row in coeffs:
-                if isinstance(row, list):
-                    self.coeffs.append(self.__class__(row, support_start[1:]))
-    
-    def __xsupport(self):
-        return range(self._xsupport_start, self._xsupport_start + len(self.coeffs))
+    @property
+    def coeffs(self) -> np.ndarray:
+        """The coefficients within the support, as a view into the (possibly larger) capacity buffer."""
+        return self._buf[tuple(slice(o, o + n) for o, n in zip(self._lo, self._shape))]
+
+    @coeffs.setter
+    def coeffs(self, arr: np.ndarray):
+        self._buf = arr
+        self._lo = (0,) * arr.ndim
+        self._shape = arr.shape
+        self._support_cache = None
+        self._is_real_cache = None
+
+    def _grow(self, grow_lo: tuple[int], grow_hi: tuple[int]):
+        """Extends the logical window by `grow_lo`/`grow_hi` zero cells on the two sides of each
+        axis, updating `support_start`. The window is widened in place when the capacity buffer
+        has headroom; otherwise the buffer is reallocated with its capacity at least doubled,
+        leaving slack on both sides so that repeated prepends and appends are amortized O(1)."""
+        self._support_start = tuple(s - lo for s, lo in zip(self._support_start, grow_lo))
+        self._support_cache = None
+        new_shape = tuple(n + lo + hi for n, lo, hi in zip(self._shape, grow_lo, grow_hi))
+
+        if all(o >= lo and cap - o - n >= hi
+               for o, n, cap, lo, hi in zip(self._lo, self._shape, self._buf.shape, grow_lo, grow_hi)):
+            # the buffer is zero outside the window, so widening it exposes zero cells
+            self._lo = tuple(o - lo for o, lo in zip(self._lo, grow_lo))
+            self._shape = new_shape
+            return
+
+        new_cap = tuple(max(2 * cap, n) for cap, n in zip(self._buf.shape, new_shape))
+        new_lo = tuple((cap - n) // 2 for cap, n in zip(new_cap, new_shape))
+
+        buf = np.zeros(new_cap, dtype=self._buf.dtype)
+        buf[tuple(slice(o + lo, o + lo + n) for o, lo, n in zip(new_lo, grow_lo, self._shape))] = self.coeffs
+
+        self._buf = buf
+        self._lo = new_lo
+        self._shape = new_shape
 
     def support(self) -> tuple[range]:
         """Returns a tuple containing support ranges for all dimensions, i.e.,
         the hyper-parallelepiped in the grid containing all the coefficients of the polynomial."""
-        xsupp = self.__xsupport()
+        if self._support_cache is None:
+            self._support_cache = tuple(range(s, s + n) for s, n in zip(self._support_start, self._shape))
+
+        return self._support_cache
 
-        if self.dim == 1:
-            return (xsupp,)
-        
-        return (xsupp, *minimal_covering_range([c.support() for c in self.coeffs]))
-    
     @property
     def support_start(self):
-        return tuple([t.start for t in self.support()])
-    
+        return self._support_start
+
+    def coeff_array(self, rng=None) -> np.ndarray:
+        r"""Returns a `dim`-dimensional ndarray containing the coefficients, zero-padded
+        where `rng` falls outside of the support.
+
+        Note:
+            The stop element of the ranges are not included.
+
+        Args:
+            rng: `dim`-dimensional tuple of range objects, giving the range for the hyper-parallelepiped along each axis. Defaults to the support of the sequence, as returned by `support()`.
+        """
+        if rng is None:
+            return self.coeffs.copy()
+
+        out = np.zeros(tuple(r.stop - r.start for r in rng), dtype=self._buf.dtype)
+
+        src = []
+        dst = []
+        for r, s, n in zip(rng, self._support_start, self._shape):
+            lo = max(0, r.start - s) # overlap between the support and the requested range,
+            hi = min(n, r.stop - s)  # relative to the support start
+
+            if lo >= hi:
+                return out
+
+            src.append(slice(lo, hi))
+            dst.append(slice(lo + s - r.start, hi + s - r.start))
+
+        out[tuple(dst)] = self.coeffs[tuple(src)]
+        return out
+
     def coeff_list(self, rng=None):
         r"""Returns a `dim`-dimensional list containing the coefficients.
 
         Note:
             The stop element of the ranges are not included in the list.
-        
+
         Args:
             rng: `dim`-dimensional tuple of range objects, giving the range for the hyper-parallelepiped along each axis. Defaults to the support of the sequence, as returned by `support()`.
         """
         if rng is None:
-            rng = self.support()
+            return self.coeffs.tolist()
+
+        return self.coeff_array(rng).tolist()
 
-        if self.dim == 1:
-            return [self[k] for k in rng[0]]
-        
-        hcube = []
-        lens = tuple(r.stop - r.start for r in rng[1:])
-        for k in range(rng[0].start, rng[0].stop):
-
-            if k - self._xsupport_start in range(len(self.coeffs)):
-                hcube.append(self.coeffs[k - self._xsupport_start].coeff_list(rng[1:]))
-            else:
-                hcube.append(zeros(lens))
-        
-        return hcube
-    
     def duplicate(self):
-        return self.__class__(self.coeff_list(), self.support_start)
-    
+        return self.__class__(self.coeffs, self._support_start)
+
     def __getitem__(self, k: int) -> generic_complex:
         """Returns the coefficient in position (k1, ..., kd), or zero if the element is outside the support.
         """
         if not isinstance(k, tuple):
+            if self.dim == 1: # fast path for univariate sequences, no tuple machinery
+                i = k - self._support_start[0]
+                if 0 <= i < self._shape[0]:
+                    return self.coeffs[i]
+
+                return self._buf.dtype.type(0)
+
             k = (k,)
 
         if len(k) != self.dim:
             raise ValueError("Number of indices must coincide with the dimension of the sequence.")
-        
-        x = k[0]
-        if x in self.__xsupport():
-            if self.dim == 1:
-                return self.coeffs[x - self._xsupport_start]
-            
-            return self.coeffs[x - self._xsupport_start][k[1:]]
-        
-        return bd.make_complex(0)
+
+        idx = tuple(x - s for x, s in zip(k, self._support_start))
+        if all(0 <= i < n for i, n in zip(idx, self.coeffs.shape)):
+            return self.coeffs[idx]
+
+        return self.coeffs.dtype.type(0)
 
     def __setitem__(self, k: int, c: generic_complex):
         """Sets the coefficient of (k1, ..., kd) to be c, allocating space if needed.
         """
-        x = k[0]
-        if self.dim == 1:
-            if self._xsupport_start + len(self.coeffs) <= x:
-                self.coeffs.extend([bd.make_complex(0)] * (x - self._xsupport_start - len(self.coeffs) + 1))
-            elif self._xsupport_start > x:
-                self.coeffs = [bd.make_complex(0)] * (self._xsupport_start - x) + self.coeffs
-                self._xsupport_start = x
-            self.coeffs[x - self._xsupport_start] = bd.make_complex(c)
-        else:
-            if self._xsupport_start + len(self.coeffs) <= x:
-                for _ in range(x - self._xsupport_start - len(self.coeffs) + 1):
-                    self.coeffs.append(self.__class__([], support_start=(0,) * (self.dim-1)))
-            elif self._xsupport_start > x:
-                for _ in range(self._xsupport_start - x):
-                    self.coeffs = [self.__class__([], support_start=(0,) * (self.dim-1))] + self.coeffs
-                self._xsupport_start = x
+        if not isinstance(k, tuple):
+            k = (k,)
+
+        if len(k) != self.dim:
+            raise ValueError("Number of indices must coincide with the dimension of the sequence.")
+
+        idx = tuple(x - s for x, s in zip(k, self._support_start))
+        grow_lo = tuple(max(0, -i) for i in idx)
+        grow_hi = tuple(max(0, i - n + 1) for i, n in zip(idx, self._shape))
 
-            self.coeffs[x - self._xsupport_start][k[1:]] = bd.make_complex(c)
+        if any(lo > 0 or hi > 0 for lo, hi in zip(grow_lo, grow_hi)):
+            self._grow(grow_lo, grow_hi)
+            idx = tuple(x - s for x, s in zip(k, self._support_start))
+
+        self.coeffs[idx] = make_coeff(c, self._buf.dtype)
+        self._is_real_cache = None
 
     def l1_norm(self) -> generic_real:
         """Computes the l1 norm of the sequence.
@@ -240,9 +330,7 @@ class ComplexL0SequenceMD:
         Returns:
             float: The sum of absolute values of coefficients.
         """
-        if self.dim == 1:
-            return sum(bd.abs(c) for c in self.coeffs)
-        return sum(c.l1_norm() for c in self.coeffs)
+        return np.abs(self.coeffs).sum()
 
     def l2_norm(self) -> generic_real:
         """Computes the l2 norm.
@@ -258,44 +346,42 @@ class ComplexL0SequenceMD:
         Returns:
             float: The squared l2 norm, i.e., the sum of the squared absolute values.
         """
-        if self.dim == 1:
-            return sum(bd.abs2(c) for c in self.coeffs)
-        return sum(c.l2_squared_norm() for c in self.coeffs)
-    
+        return (self.coeffs.real ** 2 + self.coeffs.imag ** 2).sum()
+
     def is_real(self) -> bool:
-        """Whether the sequence has only real elements."""
-        if self.dim == 1:
-            return all(bd.im(F) <= bd.machine_threshold() for F in self.coeffs)
-        return all(c.is_real() for c in self.coeffs)
-    
+        """Whether the sequence has only real elements. The answer is cached until the
+        coefficients are modified."""
+        if self._is_real_cache is None:
+            self._is_real_cache = bool(np.all(np.abs(self.coeffs.imag) <= bd.machine_threshold()))
+
+        return self._is_real_cache
+
     def is_imaginary(self) -> bool:
         """Whether the sequence has only imaginary elements."""
-        if self.dim == 1:
-            return all(bd.re(F) <= bd.machine_threshold() for F in self.coeffs)
-        return all(c.is_imaginary() for c in self.coeffs)
-    
+        return bool(np.all(np.abs(self.coeffs.real) <= bd.machine_threshold()))
+
     def _coeffwise_unary(self, func):
-        """Returns a new sequence object `r` (as an object of the same class as self) whose coefficients are `r[k] = func(self[k])`.
-        
+        """Returns a new sequence object `r` (as an object of the same class as self) whose coefficients are `r[k] = func(self[k])`, where `func` operates elementwise on ndarrays.
+
         Note:
             It is implicitly assumed that func(0) == 0, so that compactness of the support is preserved."""
-        cf = self.coeff_list()
-        deep_inplace(cf, func)
-        return self.__class__(cf, self.support_start)
+        return self.__class__(func(self.coeffs), self._support_start)
 
     def _coeffwise_binary(self, other, func):
-        """Returns a new sequence object `r` (as an object of the same class as self) whose coefficients are the pairwise `r[k] = func(self[k], other[k])`.
-        
+        """Returns a new sequence object `r` (as an object of the same class as self) whose coefficients are the pairwise `r[k] = func(self[k], other[k])`, where `func` must be an elementwise ufunc.
+
         Note:
-            It is implicitly assumed that func(0, 0) == 0, i.e., the support of `r` will be the union of the supports of `p`, `q`."""
+            It is implicitly assumed that func(x, 0) == x, i.e., the support of `r` will be the union of the supports of `p`, `q`."""
         union_support = tuple(range(min(x.start, y.start), max(x.stop, y.stop)) for x, y in zip(self.support(), other.support()))
-        union_start = tuple(min(x, y) for x, y in zip(self.support_start, other.support_start))
+        union_start = tuple(r.start for r in union_support)
 
-        cf1 = self.coeff_list(union_support)
-        cf2 = other.coeff_list(union_support)
-        deep_inplace_binary(cf1, cf2, func)
+        # Embed self into the union buffer, then apply func in place on the window
+        # covered by other; outside of it, func(x, 0) == x leaves the buffer untouched.
+        out = self.coeff_array(union_support)
+        view = out[tuple(slice(s - u, s - u + n) for s, u, n in zip(other._support_start, union_start, other._shape))]
 
-        return self.__class__(cf1, union_start)
+        tiled_binary(func, view, other.coeffs, view)
+        return self.__class__(out, union_start)
     
     def __add__(self, other):
         if isinstance(other, Number):
@@ -306,7 +392,7 @@ class ComplexL0SequenceMD:
         elif not isinstance(other, ComplexL0SequenceMD):
             raise TypeError("Sequence addition admits only other sequences or scalars.")
         
-        return self._coeffwise_binary(other, lambda x, y: x + y)
+        return self._coeffwise_binary(other, np.add)
     
     def __radd__(self, other):
         return self + other
@@ -323,7 +409,7 @@ class ComplexL0SequenceMD:
         elif not isinstance(other, ComplexL0SequenceMD):
             raise TypeError("Sequence addition admits only other sequences or scalars.")
         
-        return self._coeffwise_binary(other, lambda x, y: x - y)
+        return self._coeffwise_binary(other, np.subtract)
     
     def __rsub__(self, other):
         if isinstance(other, Number):
@@ -352,7 +438,7 @@ class PolynomialMD(ComplexL0SequenceMD):
         t = self.support_start
         t = tuple(t[j] + (j == a) * k for j in range(len(t)))
 
-        return PolynomialMD(self.coeff_list(), t)
+        return PolynomialMD(self.coeffs, t)
 
     def effective_degree(self) -> int:
         """Returns a tuple containing the effective degrees with respect to each variable (max degree - min degree).
@@ -369,10 +455,9 @@ class PolynomialMD(ComplexL0SequenceMD):
         Returns:
             PolynomialMD: The conjugate polynomial.
         """
-        cf = self.coeff_list()
-        deep_inplace(cf, lambda x: bd.conj(x), reverse=True)
+        cf = np.conj(self.coeffs)[tuple(slice(None, None, -1) for _ in range(self.dim))]
 
-        return PolynomialMD(cf, tuple(-rng.stop + 1 for rng in self.support()))
+        return PolynomialMD(cf, tuple(-(s + n - 1) for s, n in zip(self._support_start, self._shape)))
     
     def schwarz_transform(self):
         r"""Returns the anti-analytic polynomial whose real part gives the current polynomial.
@@ -382,39 +467,78 @@ class PolynomialMD(ComplexL0SequenceMD):
         Returns:
             Polynomial: The Schwarz transform of the polynomial.
         """
-        st = self.duplicate() # TODO This method can be more efficient
-
-        for k in itertools.product(*self.support()):
-            st[*k] = schwarz_multiplier(k) * st[*k]
-
-        return st
+        return PolynomialMD(self.coeffs * schwarz_mask(self._shape, self._support_start), self._support_start)
     
     def __mul__(self, other):
         if isinstance(other, Number):
             return self._coeffwise_unary(lambda x: x * other)
         elif not isinstance(other, PolynomialMD):
             raise TypeError("Polynomial addition admits only other polynomials or scalars.")
-        
-        sup_a = self.support()
-        sup_b = other.support()
 
-        len_a = tuple(x.stop - x.start for x in sup_a)
-        len_b = tuple(x.stop - x.start for x in sup_b)
-        len_c = tuple(la + lb - 1 for la, lb in zip(len_a, len_b))
+        # object-dtype coefficients must not reach rfftn, which would silently coerce them to float64
+        if self._buf.dtype != object and self.is_real() and other.is_real():
+            return self._mul_real(other)
+
+        return PolynomialMD.mul_batch([self], other)[0]
+
+    def _mul_real(self, other):
+        """Multiplies two polynomials with real coefficients through the real-input FFT.
+        By Hermitian symmetry, this halves both the transform along the last axis and the
+        pointwise multiplication; the convolution of real sequences is again real."""
+        len_c = tuple(la + lb - 1 for la, lb in zip(self.coeffs.shape, other.coeffs.shape))
+        pad_shape = tuple(next_power_of_two(lc) for lc in len_c)
 
-        rng_a = tuple(range(xa.start, xa.start + next_power_of_two(xc)) for xa, xc in zip(sup_a, len_c))
-        rng_b = tuple(range(xb.start, xb.start + next_power_of_two(xc)) for xb, xc in zip(sup_b, len_c))
-        # augmented support for a and b so that we can carry out FFT on their coeff_list()
+        f1 = scipy.fft.rfftn(self.coeffs.real, s=pad_shape, workers=-1)
+        f2 = scipy.fft.rfftn(other.coeffs.real, s=pad_shape, workers=-1)
+        tiled_binary(np.multiply, f1, f2, f1)
 
-        # TODO use extra precision here
-        cf1 = bd.fft_md(self.coeff_list(rng_a))
-        cf2 = bd.fft_md(other.coeff_list(rng_b))
+        cf = scipy.fft.irfftn(f1, s=pad_shape, workers=-1)[tuple(slice(0, l) for l in len_c)]
 
-        # Multiply in the Fourier domain
-        deep_inplace_binary(cf1, cf2, lambda x, y: x * y) # cf1 *= cf2
+        return PolynomialMD(cf, tuple(x + y for x, y in zip(self._support_start, other._support_start)))
 
-        # Inverse FFT to get the result, support starts are the sum in each individual variable
-        return PolynomialMD(deep_truncate(bd.ifft_md(cf1), len_c), tuple(x.start + y.start for x, y in zip(sup_a, sup_b)))
+    @staticmethod
+    def mul_batch(ps: list, q) -> list:
+        """Multiplies every polynomial in `ps` by `q`.
+
+        The Fourier transform of `q` is computed only once per padded FFT shape, so when the
+        polynomials in `ps` share their shape (as in iterative algorithms) the cost per product
+        drops to one forward and one inverse transform.
+
+        Args:
+            ps (list[PolynomialMD]): The polynomials to be multiplied by `q`.
+            q (PolynomialMD): The common factor.
+
+        Returns:
+            list[PolynomialMD]: The products `p * q`, in the same order as `ps`.
+        """
+        len_b = q.coeffs.shape
+        fq_cache = {}
+
+        products = []
+        for p in ps:
+            len_a = p.coeffs.shape
+            len_c = tuple(la + lb - 1 for la, lb in zip(len_a, len_b))
+            pad_shape = tuple(next_power_of_two(lc) for lc in len_c)
+
+            if pad_shape not in fq_cache:
+                cf2 = np.zeros(pad_shape, dtype=q.coeffs.dtype)
+                cf2[tuple(slice(0, l) for l in len_b)] = q.coeffs
+                fq_cache[pad_shape] = scipy.fft.fftn(cf2, workers=-1)
+
+            # TODO use extra precision here
+            cf1 = np.zeros(pad_shape, dtype=p.coeffs.dtype)
+            cf1[tuple(slice(0, l) for l in len_a)] = p.coeffs
+
+            cf1 = scipy.fft.fftn(cf1, workers=-1)
+
+            # Multiply in the Fourier domain, one cache-resident tile at a time
+            tiled_binary(np.multiply, cf1, fq_cache[pad_shape], cf1) # cf1 *= fft(q)
+
+            # Inverse FFT to get the result, support starts are the sum in each individual variable
+            products.append(PolynomialMD(scipy.fft.ifftn(cf1, workers=-1)[tuple(slice(0, l) for l in len_c)],
+                                         tuple(x + y for x, y in zip(p._support_start, q._support_start))))
+
+        return products
     
     def __rmul__(self, other):
         return self * other
@@ -440,9 +564,60 @@ class PolynomialMD(ComplexL0SequenceMD):
         if self.dim != len(z):
             raise ValueError("Incorrect number of variables to evaluate the multivariate polynomial.")
 
-        return deep_horner_eval(self.coeff_list(), z) * prod(zk ** nk for zk, nk in zip(z, self.support_start))
+        return horner_eval(self.coeffs, z) * prod(zk ** nk for zk, nk in zip(z, self.support_start))
+
+    def compile(self):
+        """Returns a callable `f(z1, ..., zd)` evaluating the polynomial, specialized to its
+        current shape and support by runtime code generation: the Horner recurrence is fully
+        unrolled into one expression with all indices constant-folded, which pays off when
+        the same polynomial is evaluated at many points.
+
+        Note:
+            The returned callable is bound to the coefficients at the time of the call;
+            compile again after the polynomial is modified. Polynomials too large for
+            unrolling fall back to the generic evaluator.
+        """
+        if self.coeffs.size == 0 or self.coeffs.size > _COMPILE_MAX_COEFFS:
+            return self.__call__
 
-    def eval_at_roots_of_unity(self, N: int | tuple) -> list[generic_complex]:
+        namespace = {}
+        exec(_compiled_eval_code(self._shape, self._support_start), namespace)
+
+        return functools.partial(namespace['_eval'], self.coeffs.ravel())
+
+    def eval_many(self, Z) -> np.ndarray:
+        """Evaluates the polynomial at a batch of points at once.
+
+        The axes of the coefficient grid are reduced one at a time by Horner's rule applied
+        across the whole batch, so the Python-level overhead is amortized over all the points.
+
+        Args:
+            Z (np.ndarray): `(K, dim)` array whose rows are the evaluation points.
+
+        Returns:
+            np.ndarray: The K evaluations, the k-th being `self(*Z[k])`.
+        """
+        Z = np.asarray(Z, dtype=self.coeffs.dtype)
+        K = Z.shape[0]
+
+        if Z.ndim != 2 or Z.shape[1] != self.dim:
+            raise ValueError("Incorrect number of variables to evaluate the multivariate polynomial.")
+
+        if self.coeffs.size == 0:
+            return np.zeros(K, dtype=self.coeffs.dtype)
+
+        acc = np.broadcast_to(self.coeffs, (K,) + self._shape)
+        for axis in range(self.dim - 1, -1, -1):
+            z = Z[:, axis].reshape((K,) + (1,) * axis) # broadcasts against the remaining axes
+
+            new = acc[..., -1]
+            for i in range(acc.shape[-1] - 2, -1, -1):
+                new = new * z + acc[..., i]
+            acc = new
+
+        return acc * np.prod(Z ** np.asarray(self._support_start), axis=1)
+
+    def eval_at_roots_of_unity(self, N: int | tuple) -> np.ndarray:
         """Evaluates the polynomial at the N-th roots of unity using the inverse FFT.
 
         Args:
@@ -450,8 +625,8 @@ class PolynomialMD(ComplexL0SequenceMD):
                              A tuple of appropriate dimension can be given, where the k-th variable will be computed in the `N[k]`-th roots of unity.
 
         Returns:
-            list[complex]: List of evaluations at the N-th roots of unity.
-            The k-th element will be `self[w^k]`, where `w` is the main N-th root of unity.
+            np.ndarray: `dim`-dimensional grid of evaluations at the N-th roots of unity.
+            The (k1, ..., kd)-th element will be the evaluation at `(w_1^k1, ..., w_d^kd)`, where `w_j` is the main `N[j]`-th root of unity.
         """
         if isinstance(N, Number):
             N = (N,) * self.dim
@@ -459,17 +634,15 @@ class PolynomialMD(ComplexL0SequenceMD):
         if self.dim != len(N):
             raise ValueError("The dimension of the grid must match the dimension of the polynomial.")
 
-        sup = self.support()
-
         N = tuple(next_power_of_two(k) for k in N)
-        M = tuple(next_power_of_two(max(k, r.stop - r.start)) for k, r in zip(N, sup))
+        M = tuple(next_power_of_two(max(k, n)) for k, n in zip(N, self._shape))
 
-        coeffs = self.coeff_list(tuple(range(r.start, r.start + k) for k, r in zip(M, sup)))
-        coeffs = deep_sequence_shift(coeffs, self.support_start)
+        coeffs = self.coeff_array(tuple(range(s, s + m) for s, m in zip(self._support_start, M)))
+        coeffs = np.roll(coeffs, self._support_start, axis=tuple(range(self.dim)))
         # This has the effect of having everything multiplied by z[k]^s[k] for each k
 
-        evals = bd.ifft_md(coeffs, normalize=False) # M evaluations at the M-th roots of unity
-        return deep_sequence_skip(evals, tuple(m//n for m, n in zip(M, N)))
+        evals = scipy.fft.ifftn(coeffs, norm='forward', workers=-1) # M evaluations at the M-th roots of unity
+        return evals[tuple(slice(None, None, m // n) for m, n in zip(M, N))]
     
     def sup_norm(self, N=1024):
         """Estimates the supremum norm of the polynomial over the unit multitorus.
@@ -480,7 +653,7 @@ class PolynomialMD(ComplexL0SequenceMD):
         Returns:
             float: An estimate for the supremum norm of the polynomial over the unit circle.
         """
-        return max([abs(x) for x in flatten(self.eval_at_roots_of_unity(N))])
+        return float(np.abs(self.eval_at_roots_of_unity(N)).max())
     
     def truncate(self, *rng: tuple[range] | tuple[tuple[range]]):
         """Keeps only the coefficients in the hyperrectangle defined by rng, discarding the other.
@@ -499,14 +672,12 @@ class PolynomialMD(ComplexL0SequenceMD):
         
         rng = tuple(range(r.start, r.stop+1) for r in rng)
 
-        return PolynomialMD(self.coeff_list(rng), tuple(r.start for r in rng))
+        return PolynomialMD(self.coeff_array(rng), tuple(r.start for r in rng))
     
 
 def to_poly_md(p: Polynomial, m: int) -> PolynomialMD:
     """Converts the given univariate polynomial P(z_m) as a m-variate polynomial object representing `P'(z_1, ..., z_m) = P(z_m)`."""
 
-    cf = p.coeffs
-    for _ in range(m-1):
-        cf = [cf]
+    cf = np.asarray(p.coeffs, dtype=coeff_dtype())[(np.newaxis,) * (m-1)] # zero-copy reshape to m axes
 
     return PolynomialMD(cf, support_start=(0,)*(m-1) + (p.support_start,))
\ No newline at end of file
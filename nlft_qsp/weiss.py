@@ -1,8 +1,11 @@
 
+import numpy as np
+import scipy.fft
+
 import numerics as bd
 
 from poly import Polynomial
-from poly_md import PolynomialMD, deep_inplace, deep_sequence_shift
+from poly_md import PolynomialMD
 from util import next_power_of_two, sequence_shift
 
 WEISS_MAX_ATTEMPTS = 3
@@ -121,9 +124,9 @@ def laurent_approximation_md(points: list, m: int) -> PolynomialMD:
     N = len(points)
     support_start = (-N//2,) * m
 
-    coeffs = bd.fft_md(points, normalize=True)
-    coeffs = deep_sequence_shift(coeffs, support_start) # Zero frequency in the middle
-    
+    coeffs = scipy.fft.fftn(np.asarray(points, dtype=complex), norm='forward', workers=-1)
+    coeffs = np.roll(coeffs, support_start, axis=tuple(range(m))) # Zero frequency in the middle
+
     return PolynomialMD(coeffs, support_start)
 
 def complete_md(b: PolynomialMD, verbose=False):
@@ -145,14 +148,12 @@ def complete_md(b: PolynomialMD, verbose=False):
         N *= 2
 
         b_points = b.eval_at_roots_of_unity(N)
-        deep_inplace(b_points, lambda bz: bd.log(1 - bd.abs2(bz))/2)
-        R = laurent_approximation_md(b_points, m)
+        R = laurent_approximation_md(bd.log(1 - bd.abs2(b_points))/2, m)
 
         G = R.schwarz_transform()
 
         G_points = G.eval_at_roots_of_unity(N)
-        deep_inplace(G_points, lambda gz: bd.exp(gz))
-        a = laurent_approximation_md(G_points, m)
+        a = laurent_approximation_md(bd.exp(G_points), m)
 
         #a = a.truncate(-b.effective_degree(), 0) # a and b must have the same support
 
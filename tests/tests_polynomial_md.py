@@ -2,8 +2,14 @@
 from math import sqrt
 import unittest
 
+import mpmath as mp
+
 import nlft_qsp.numerics as bd
 
+from nlft_qsp.numerics import set_backend
+from nlft_qsp.numerics.backend_mpmath import MPMathBackend
+from nlft_qsp.numerics.backend_numpy import NumpyBackend
+
 from nlft_qsp.nlft_md import StairlikeSequence2D
 from nlft_qsp.poly_md import PolynomialMD
 from nlft_qsp.rand import random_complex, random_list, random_sequence, random_stairlike_sequence_2d
@@ -166,6 +172,25 @@ class PolynomialMDTestCase(unittest.TestCase):
             [-1, -7, 0]
         ])
 
+    def test_mul_batch(self):
+        p1 = PolynomialMD(random_list(10, (3, 4)), support_start=(0, -2))
+        p2 = PolynomialMD(random_list(10, (3, 4)), support_start=(1, 1))
+        p3 = PolynomialMD(random_list(10, (5, 2)), support_start=(-1, 0))
+        q = PolynomialMD(random_list(10, (2, 3)), support_start=(0, -1))
+
+        for r, p in zip(PolynomialMD.mul_batch([p1, p2, p3], q), [p1, p2, p3]):
+            self.assertAlmostEqual((r - p*q).l2_norm(), 0, delta=10*bd.machine_threshold())
+
+    def test_mul_real(self):
+        p = PolynomialMD([[1, 2], [3, 4], [5, 6]], support_start=(0, -2))
+        q = PolynomialMD([[2, 0, 1], [1, -1, 0]], support_start=(-1, 1))
+
+        self.assertTrue(p.is_real() and q.is_real())
+
+        # Real operands go through the real-input FFT; compare with the complex path.
+        r = PolynomialMD.mul_batch([p], q)[0]
+        self.assertAlmostEqual((p*q - r).l2_norm(), 0, delta=10*bd.machine_threshold())
+
     def test_eval(self):
         p = PolynomialMD([ # P(x, y) = 2x^2 + 3xy + y^2
             [0, 0, 1],
@@ -189,6 +214,35 @@ class PolynomialMDTestCase(unittest.TestCase):
         ], (0,0,0))
         self.assertEqual(p(2, 3, 1), 4)
 
+    def test_eval_mpmath_backend(self):
+        set_backend(MPMathBackend(mp.mp)) # coefficients are stored in an object-dtype array
+        try:
+            p = PolynomialMD([ # P(x, y) = (1/y + 2 + 3y) + 3x + x^2(2/y + y)
+                [1, 2, 3],
+                [0, 3, 0],
+                [2, 0, 1]
+            ], (0, -1))
+            self.assertAlmostEqual(complex(p(mp.mpc(2), mp.mpc(3))), 32, delta=10*bd.machine_threshold())
+        finally:
+            set_backend(NumpyBackend())
+
+    def test_compile(self):
+        p = PolynomialMD(random_list(10, (3, 4, 2)), support_start=(0, -2, 1))
+        f = p.compile()
+
+        for x in bd.unitroots(4):
+            for y in bd.unitroots(4):
+                for z in bd.unitroots(4):
+                    self.assertAlmostEqual(f(x, y, z), p(x, y, z), delta=10*bd.machine_threshold())
+
+    def test_eval_many(self):
+        p = PolynomialMD(random_list(10, (3, 4, 2)), support_start=(0, -2, 1))
+
+        Z = [[x, y, z] for x in bd.unitroots(3) for y in bd.unitroots(3) for z in bd.unitroots(3)]
+
+        for v, (x, y, z) in zip(p.eval_many(Z), Z):
+            self.assertAlmostEqual(v, p(x, y, z), delta=10*bd.machine_threshold())
+
     def test_eval_at_roots_of_unity(self):
         seq = random_sequence(10000, (4, 4, 4))
 